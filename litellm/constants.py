@@ -19,6 +19,15 @@ DEFAULT_NUM_WORKERS_LITELLM_PROXY = int(
 )
 DYNAMIC_RATE_LIMIT_ERROR_THRESHOLD_PER_MINUTE = int(os.getenv("DYNAMIC_RATE_LIMIT_ERROR_THRESHOLD_PER_MINUTE", 1))
 DEFAULT_SQS_BATCH_SIZE = int(os.getenv("DEFAULT_SQS_BATCH_SIZE", 512))
+DEFAULT_REMODLAI_EMBEDDINGS_BATCH_SIZE = int(
+    os.getenv("DEFAULT_REMODLAI_EMBEDDINGS_BATCH_SIZE", 64)
+)
+DEFAULT_REMODLAI_EMBEDDINGS_MAX_RETRIES = int(
+    os.getenv("DEFAULT_REMODLAI_EMBEDDINGS_MAX_RETRIES", 4)
+)
+DEFAULT_REMODLAI_IMAGE_EMBEDDING_CACHE_SIZE = int(
+    os.getenv("DEFAULT_REMODLAI_IMAGE_EMBEDDING_CACHE_SIZE", 1024)
+)
 SQS_SEND_MESSAGE_ACTION = "SendMessage"
 SQS_API_VERSION = "2012-11-05"
 DEFAULT_MAX_RETRIES = int(os.getenv("DEFAULT_MAX_RETRIES", 2))
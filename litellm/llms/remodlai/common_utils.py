@@ -0,0 +1,30 @@
+from functools import lru_cache
+from typing import Optional
+
+from litellm.secret_managers.main import get_secret_str
+
+
+@lru_cache(maxsize=32)
+def get_remodlai_complete_url(
+    api_base: Optional[str], api_base_secret_name: str, endpoint: str
+) -> str:
+    """
+    Resolve the full URL for a Remodl AI OpenAI-compatible endpoint.
+
+    Falls back to `api_base_secret_name` when `api_base` is not set. Results are
+    cached for the lifetime of the process, so secret lookups and URL
+    normalization only happen once per distinct `api_base`.
+    """
+    api_base = api_base or get_secret_str(api_base_secret_name)
+
+    if api_base is None:
+        raise ValueError(
+            f"{api_base_secret_name} is not set. Please configure the API base."
+        )
+
+    api_base = api_base.rstrip("/")
+    if api_base.endswith(f"/{endpoint}"):
+        return api_base
+    if api_base.endswith("/v1"):
+        return f"{api_base}/{endpoint}"
+    return f"{api_base}/v1/{endpoint}"
@@ -8,6 +8,7 @@ function calling, etc.) for both Nova native models and any custom model
 hosted on the cluster.
 """
 
+from functools import lru_cache
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -32,6 +33,7 @@ from litellm.litellm_core_utils.llm_response_utils.convert_dict_to_response impo
 )
 from litellm.llms.base_llm.chat.transformation import BaseLLMException
 from litellm.llms.base_llm.responses.transformation import BaseResponsesAPIConfig
+from litellm.llms.remodlai.common_utils import get_remodlai_complete_url
 from litellm.secret_managers.main import get_secret_str
 from litellm.types.llms.openai import *
 from litellm.types.responses.main import *
@@ -46,6 +48,13 @@ else:
     LiteLLMLoggingObj = Any
 
 
+@lru_cache(maxsize=256)
+def _get_stripped_model_name(model: str) -> str:
+    if "responses/" in model:
+        model = model.replace("responses/", "")
+    return model
+
+
 class RemodlAIResponsesAPIError(BaseLLMException):
     def __init__(
         self,
@@ -229,26 +238,10 @@ class RemodlAIResponsesAPIConfig(BaseResponsesAPIConfig):
         """
         Hosted RemodlAI exposes an OpenAI-compatible `/v1/responses` endpoint.
         """
-        api_base = (
-            api_base
-            or litellm.api_base
-            or get_secret_str("REMODL_AI_API_BASE")
+        return get_remodlai_complete_url(
+            api_base or litellm.api_base, "REMODL_AI_API_BASE", "responses"
         )
 
-        if api_base is None:
-            raise ValueError(
-                "REMODL_AI_API_BASE is not set. Please configure the API base."
-            )
-
-        api_base = api_base.rstrip("/")
-        if api_base.endswith("/responses"):
-            return api_base
-        if api_base.endswith("/v1"):
-            return f"{api_base}/responses"
-        if api_base.endswith("/v1/"):
-            return f"{api_base}responses"
-        return f"{api_base}/v1/responses"
-
     def transform_streaming_response(
         self,
         model: str,
@@ -498,6 +491,4 @@ class RemodlAIResponsesAPIConfig(BaseResponsesAPIConfig):
         Align model identifiers with OpenAI naming by removing the `responses/`
         prefix that Nova allows for convenience.
         """
-        if "responses/" in model:
-            model = model.replace("responses/", "")
-        return model
+        return _get_stripped_model_name(model)
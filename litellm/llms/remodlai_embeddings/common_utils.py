@@ -1,15 +1,27 @@
-from typing import Optional, Union
-
-import httpx
+from functools import lru_cache
+from typing import Optional, Tuple
 
 from litellm.llms.base_llm.chat.transformation import BaseLLMException
+from litellm.secret_managers.main import get_secret_str
 
 
 class RemodlaiEmbeddingsError(BaseLLMException):
-    def __init__(
-        self,
-        status_code: int,
-        message: str,
-        headers: Optional[Union[dict, httpx.Headers]] = None,
-    ):
-        super().__init__(status_code=status_code, message=message, headers=headers)
+    pass
+
+
+@lru_cache(maxsize=None)
+def get_remodlai_embeddings_secrets() -> Tuple[Optional[str], Optional[str]]:
+    """
+    Returns (api_base, api_key) from `REMODLAI_EMBEDDINGS_API_BASE` /
+    `REMODLAI_EMBEDDINGS_API_KEY`, resolved once per process.
+
+    Call `clear_remodlai_embeddings_secrets_cache()` after changing them at runtime.
+    """
+    return (
+        get_secret_str("REMODLAI_EMBEDDINGS_API_BASE"),
+        get_secret_str("REMODLAI_EMBEDDINGS_API_KEY"),
+    )
+
+
+def clear_remodlai_embeddings_secrets_cache() -> None:
+    get_remodlai_embeddings_secrets.cache_clear()
@@ -0,0 +1,483 @@
+"""
+Remodl AI Embeddings (Nova) - uses `llm_http_handler.py` to make httpx requests
+
+Large inputs are split into `batch_size` chunks, each sent as one `/v1/embeddings`
+request (concurrently on the async path) and merged back into a single response.
+Batches rejected with 429 / 503 are retried with exponential backoff, honoring
+`Retry-After`, up to `DEFAULT_REMODLAI_EMBEDDINGS_MAX_RETRIES` times per batch. These
+retries stack on top of litellm's own (`num_retries`, Router retries): each of those
+attempts re-runs the whole batched request, inner retries included, so set
+`DEFAULT_REMODLAI_EMBEDDINGS_MAX_RETRIES=0` when retrying at that level. On the async
+path, the first batch that fails for good cancels the batches still in flight.
+Base64 image embeddings are cached in-process, keyed by a SHA-256 of the image, so
+repeated images skip the upstream round trip.
+
+Request/Response transformation is handled in `transformation.py`
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from typing import Any, Coroutine, Dict, List, Optional, Tuple, Union
+
+from litellm.caching.dual_cache import LimitedSizeOrderedDict
+from litellm.constants import (
+    DEFAULT_REMODLAI_EMBEDDINGS_BATCH_SIZE,
+    DEFAULT_REMODLAI_EMBEDDINGS_MAX_RETRIES,
+    DEFAULT_REMODLAI_IMAGE_EMBEDDING_CACHE_SIZE,
+)
+from litellm.litellm_core_utils.litellm_logging import Logging as LiteLLMLoggingObj
+from litellm.llms.custom_httpx.http_handler import (
+    AsyncHTTPHandler,
+    HTTPHandler,
+    _get_httpx_client,
+    get_async_httpx_client,
+)
+from litellm.llms.custom_httpx.llm_http_handler import BaseLLMHTTPHandler
+from litellm.types.utils import EmbeddingResponse, LlmProviders, Usage
+from litellm.utils import _calculate_retry_after
+
+from ..common_utils import RemodlaiEmbeddingsError, get_remodlai_embeddings_secrets
+from .transformation import _is_base64_encoded
+
+RETRYABLE_STATUS_CODES = (429, 503)
+
+# request params that change the returned vector, and so are part of the cache key
+IMAGE_EMBEDDING_CACHE_KEY_PARAMS = (
+    "task",
+    "adapter",
+    "instructions",
+    "dimensions",
+    "return_multivector",
+    "encoding_format",
+)
+
+ImageEmbeddingCacheKey = Tuple
+
+_image_embedding_cache: LimitedSizeOrderedDict = LimitedSizeOrderedDict(
+    max_size=DEFAULT_REMODLAI_IMAGE_EMBEDDING_CACHE_SIZE
+)
+# sync `embedding()` calls run on executor threads, so cache reads and writes are locked
+_image_embedding_cache_lock = threading.Lock()
+
+
+def _get_image_digest(data_uri: str) -> bytes:
+    """
+    SHA-256 of the base64 payload, ignoring the `data:<mediatype>,` prefix.
+
+    Hashed in a single call so OpenSSL can use its hardware-accelerated SHA-256
+    path (SHA-NI / ARMv8 crypto extensions) when available.
+    """
+    _, _, payload = data_uri.partition(",")
+    return hashlib.sha256(payload.encode("ascii")).digest()
+
+
+def _copy_embedding(embedding: Any) -> Any:
+    """
+    Copy a dense (list of floats) or multivector (list of lists) embedding, so
+    the cache never shares a mutable list with a response. Base64 strings are
+    immutable and returned as-is.
+    """
+    if isinstance(embedding, list):
+        return [list(v) if isinstance(v, list) else v for v in embedding]
+    return embedding
+
+
+class RemodlaiEmbeddingsHandler:
+    def __init__(self) -> None:
+        self.base_llm_http_handler = BaseLLMHTTPHandler()
+
+    def embedding(
+        self,
+        model: str,
+        input: list,
+        timeout: float,
+        logging_obj: LiteLLMLoggingObj,
+        api_base: Optional[str],
+        optional_params: dict,
+        litellm_params: dict,
+        model_response: EmbeddingResponse,
+        api_key: Optional[str] = None,
+        client: Optional[Union[HTTPHandler, AsyncHTTPHandler]] = None,
+        aembedding: Optional[bool] = False,
+    ) -> EmbeddingResponse:
+        optional_params = dict(optional_params)
+        batch_size = (
+            optional_params.pop("batch_size", None)
+            or DEFAULT_REMODLAI_EMBEDDINGS_BATCH_SIZE
+        )
+
+        cache_keys = self._get_image_cache_keys(model, api_base, input, optional_params)
+        if not any(cache_keys):
+            return self._batched_embedding(
+                model=model,
+                input=input,
+                batch_size=batch_size,
+                timeout=timeout,
+                logging_obj=logging_obj,
+                api_base=api_base,
+                optional_params=optional_params,
+                litellm_params=litellm_params,
+                model_response=model_response,
+                api_key=api_key,
+                client=client,
+                aembedding=aembedding,
+            )
+
+        cached = self._get_cached_image_embeddings(cache_keys)
+        uncached_input = [
+            item for index, item in enumerate(input) if index not in cached
+        ]
+        if not uncached_input:
+            model_response.model = model
+            model_response.usage = Usage(prompt_tokens=0, total_tokens=0)
+            return self._apply_image_embedding_cache(model_response, cache_keys, cached)
+
+        response = self._batched_embedding(
+            model=model,
+            input=uncached_input,
+            batch_size=batch_size,
+            timeout=timeout,
+            logging_obj=logging_obj,
+            api_base=api_base,
+            optional_params=optional_params,
+            litellm_params=litellm_params,
+            model_response=model_response,
+            api_key=api_key,
+            client=client,
+            aembedding=aembedding,
+        )
+        if aembedding is True:
+            return self._async_apply_image_embedding_cache(  # type: ignore
+                response, cache_keys, cached
+            )
+        return self._apply_image_embedding_cache(response, cache_keys, cached)
+
+    def _batched_embedding(
+        self,
+        model: str,
+        input: list,
+        batch_size: int,
+        timeout: float,
+        logging_obj: LiteLLMLoggingObj,
+        api_base: Optional[str],
+        optional_params: dict,
+        litellm_params: dict,
+        model_response: EmbeddingResponse,
+        api_key: Optional[str] = None,
+        client: Optional[Union[HTTPHandler, AsyncHTTPHandler]] = None,
+        aembedding: Optional[bool] = False,
+    ) -> EmbeddingResponse:
+        batches = [input[i : i + batch_size] for i in range(0, len(input), batch_size)]
+
+        if len(batches) <= 1:
+            return self._embed_batch(
+                model=model,
+                input=input,
+                timeout=timeout,
+                logging_obj=logging_obj,
+                api_base=api_base,
+                optional_params=optional_params,
+                litellm_params=litellm_params,
+                model_response=model_response,
+                api_key=api_key,
+                client=client,
+                aembedding=aembedding,
+            )
+
+        # resolve the pooled client once so every batch reuses its keep-alive connections
+        if aembedding is True:
+            if not isinstance(client, AsyncHTTPHandler):
+                client = get_async_httpx_client(
+                    llm_provider=LlmProviders.REMODLAI_EMBEDDINGS
+                )
+            return self._aembedding_batches(  # type: ignore
+                model=model,
+                batches=batches,
+                timeout=timeout,
+                logging_obj=logging_obj,
+                api_base=api_base,
+                optional_params=optional_params,
+                litellm_params=litellm_params,
+                model_response=model_response,
+                api_key=api_key,
+                client=client,
+            )
+
+        if not isinstance(client, HTTPHandler):
+            client = _get_httpx_client()
+        responses = [
+            self._embed_batch(
+                model=model,
+                input=batch,
+                timeout=timeout,
+                logging_obj=logging_obj,
+                api_base=api_base,
+                optional_params=optional_params,
+                litellm_params=litellm_params,
+                model_response=EmbeddingResponse(),
+                api_key=api_key,
+                client=client,
+                aembedding=False,
+            )
+            for batch in batches
+        ]
+        return self._merge_batch_responses(responses, model_response)
+
+    async def _aembedding_batches(
+        self,
+        model: str,
+        batches: List[list],
+        timeout: float,
+        logging_obj: LiteLLMLoggingObj,
+        api_base: Optional[str],
+        optional_params: dict,
+        litellm_params: dict,
+        model_response: EmbeddingResponse,
+        api_key: Optional[str] = None,
+        client: Optional[AsyncHTTPHandler] = None,
+    ) -> EmbeddingResponse:
+        """
+        Send all batches concurrently over the shared (pooled) async httpx client.
+        """
+        batch_requests: List[Coroutine[Any, Any, EmbeddingResponse]] = [
+            self._aembed_batch(
+                self._get_batch_request_kwargs(
+                    model=model,
+                    input=batch,
+                    timeout=timeout,
+                    logging_obj=logging_obj,
+                    api_base=api_base,
+                    optional_params=optional_params,
+                    litellm_params=litellm_params,
+                    model_response=EmbeddingResponse(),
+                    api_key=api_key,
+                    client=client,
+                )
+            )
+            for batch in batches
+        ]
+        tasks = [asyncio.ensure_future(request) for request in batch_requests]
+        try:
+            responses = await asyncio.gather(*tasks)
+        except BaseException:
+            # the merged response is lost anyway - stop the other batches from
+            # retrying / calling upstream for results nobody will read
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return self._merge_batch_responses(list(responses), model_response)
+
+    def _embed_batch(
+        self,
+        model: str,
+        input: list,
+        timeout: float,
+        logging_obj: LiteLLMLoggingObj,
+        api_base: Optional[str],
+        optional_params: dict,
+        litellm_params: dict,
+        model_response: EmbeddingResponse,
+        api_key: Optional[str] = None,
+        client: Optional[Union[HTTPHandler, AsyncHTTPHandler]] = None,
+        aembedding: Optional[bool] = False,
+    ) -> EmbeddingResponse:
+        request_kwargs = self._get_batch_request_kwargs(
+            model=model,
+            input=input,
+            timeout=timeout,
+            logging_obj=logging_obj,
+            api_base=api_base,
+            optional_params=optional_params,
+            litellm_params=litellm_params,
+            model_response=model_response,
+            api_key=api_key,
+            client=client,
+        )
+        if aembedding is True:
+            return self._aembed_batch(request_kwargs)  # type: ignore
+
+        attempt = 0
+        while True:
+            try:
+                return self.base_llm_http_handler.embedding(
+                    **request_kwargs, aembedding=False
+                )
+            except RemodlaiEmbeddingsError as e:
+                if not self._should_retry(e, attempt):
+                    raise
+                time.sleep(self._get_retry_delay(e, attempt))
+                attempt += 1
+
+    @staticmethod
+    def _get_batch_request_kwargs(
+        model: str,
+        input: list,
+        timeout: float,
+        logging_obj: LiteLLMLoggingObj,
+        api_base: Optional[str],
+        optional_params: dict,
+        litellm_params: dict,
+        model_response: EmbeddingResponse,
+        api_key: Optional[str] = None,
+        client: Optional[Union[HTTPHandler, AsyncHTTPHandler]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Keyword arguments for one `BaseLLMHTTPHandler.embedding` call, minus
+        `aembedding`.
+        """
+        return {
+            "model": model,
+            "input": input,
+            "custom_llm_provider": LlmProviders.REMODLAI_EMBEDDINGS.value,
+            "api_base": api_base,
+            "api_key": api_key,
+            "logging_obj": logging_obj,
+            "timeout": timeout,
+            "model_response": model_response,
+            "optional_params": optional_params,
+            "litellm_params": litellm_params,
+            "client": client,
+        }
+
+    async def _aembed_batch(self, request_kwargs: Dict[str, Any]) -> EmbeddingResponse:
+        attempt = 0
+        while True:
+            try:
+                return await self.base_llm_http_handler.embedding(  # type: ignore
+                    **request_kwargs, aembedding=True
+                )
+            except RemodlaiEmbeddingsError as e:
+                if not self._should_retry(e, attempt):
+                    raise
+                await asyncio.sleep(self._get_retry_delay(e, attempt))
+                attempt += 1
+
+    @staticmethod
+    def _should_retry(e: RemodlaiEmbeddingsError, attempt: int) -> bool:
+        return (
+            e.status_code in RETRYABLE_STATUS_CODES
+            and attempt < DEFAULT_REMODLAI_EMBEDDINGS_MAX_RETRIES
+        )
+
+    @staticmethod
+    def _get_retry_delay(e: RemodlaiEmbeddingsError, attempt: int) -> float:
+        """
+        Exponential backoff with jitter, or the server's `Retry-After` when given.
+        """
+        return _calculate_retry_after(
+            remaining_retries=DEFAULT_REMODLAI_EMBEDDINGS_MAX_RETRIES - attempt,
+            max_retries=DEFAULT_REMODLAI_EMBEDDINGS_MAX_RETRIES,
+            response_headers=e.headers,  # type: ignore
+        )
+
+    @staticmethod
+    def _get_image_cache_keys(
+        model: str, api_base: Optional[str], input: list, optional_params: dict
+    ) -> List[Optional[ImageEmbeddingCacheKey]]:
+        """
+        One cache key per input item - `None` for anything that isn't a base64 image.
+
+        Keys include the resolved `api_base`, so deployments sharing a model name but
+        served by different Nova servers never share vectors.
+        """
+        if DEFAULT_REMODLAI_IMAGE_EMBEDDING_CACHE_SIZE <= 0:
+            return [None] * len(input)
+        api_base = api_base or get_remodlai_embeddings_secrets()[0]
+        params = tuple(
+            optional_params.get(param) for param in IMAGE_EMBEDDING_CACHE_KEY_PARAMS
+        )
+        return [
+            (model, api_base, _get_image_digest(item), params)
+            if isinstance(item, str)
+            and item.startswith("data:")
+            and _is_base64_encoded(item)
+            else None
+            for item in input
+        ]
+
+    @staticmethod
+    def _get_cached_image_embeddings(
+        cache_keys: List[Optional[ImageEmbeddingCacheKey]],
+    ) -> Dict[int, list]:
+        cached: Dict[int, list] = {}
+        with _image_embedding_cache_lock:
+            for index, cache_key in enumerate(cache_keys):
+                if cache_key is None:
+                    continue
+                embedding = _image_embedding_cache.get(cache_key)
+                if embedding is not None:
+                    _image_embedding_cache.move_to_end(cache_key)
+                    cached[index] = embedding
+        return {index: _copy_embedding(e) for index, e in cached.items()}
+
+    async def _async_apply_image_embedding_cache(
+        self,
+        response,
+        cache_keys: List[Optional[ImageEmbeddingCacheKey]],
+        cached: Dict[int, list],
+    ) -> EmbeddingResponse:
+        return self._apply_image_embedding_cache(await response, cache_keys, cached)
+
+    @staticmethod
+    def _apply_image_embedding_cache(
+        response: EmbeddingResponse,
+        cache_keys: List[Optional[ImageEmbeddingCacheKey]],
+        cached: Dict[int, list],
+    ) -> EmbeddingResponse:
+        """
+        Store freshly returned image embeddings, and splice cached ones back into
+        their original input positions.
+        """
+        fetched = iter(response.data)
+        data: list = []
+        to_cache: List[Tuple[ImageEmbeddingCacheKey, Any]] = []
+        for index, cache_key in enumerate(cache_keys):
+            if index in cached:
+                data.append(
+                    {"object": "embedding", "index": index, "embedding": cached[index]}
+                )
+                continue
+            embedding = next(fetched)
+            embedding["index"] = index
+            if cache_key is not None:
+                to_cache.append((cache_key, _copy_embedding(embedding["embedding"])))
+            data.append(embedding)
+        response.data = data
+
+        with _image_embedding_cache_lock:
+            for cache_key, vector in to_cache:
+                # LimitedSizeOrderedDict evicts on every set, even for an existing
+                # key - drop the old entry first so a repeated image can't push out
+                # an unrelated one
+                _image_embedding_cache.pop(cache_key, None)
+                _image_embedding_cache[cache_key] = vector
+        return response
+
+    @staticmethod
+    def _merge_batch_responses(
+        responses: List[EmbeddingResponse], model_response: EmbeddingResponse
+    ) -> EmbeddingResponse:
+        """
+        Concatenate per-batch results, re-indexing embeddings to their position
+        in the original input and summing token usage.
+        """
+        data: list = []
+        prompt_tokens = 0
+        total_tokens = 0
+        for response in responses:
+            for embedding in response.data:
+                embedding["index"] = len(data)
+                data.append(embedding)
+            if response.usage is not None:
+                prompt_tokens += response.usage.prompt_tokens or 0
+                total_tokens += response.usage.total_tokens or 0
+
+        model_response.model = responses[0].model
+        model_response.data = data
+        model_response.usage = Usage(
+            prompt_tokens=prompt_tokens, total_tokens=total_tokens
+        )
+        return model_response
@@ -3,21 +3,84 @@ Transformation logic for Remodl AI Embeddings (Nova Embeddings V1).
 
 """
 
+import json
+import re
 import types
-from typing import List, Optional, Tuple, Union, cast
+from typing import FrozenSet, List, Optional, Set, Tuple, Union, cast
 
 import httpx
 
 from litellm import LlmProviders
-from litellm.secret_managers.main import get_secret_str
+from litellm._logging import verbose_logger
 from litellm.llms.base_llm.chat.transformation import BaseLLMException
 from litellm.llms.base_llm import BaseEmbeddingConfig
+from litellm.llms.remodlai.common_utils import get_remodlai_complete_url
 from litellm.litellm_core_utils.litellm_logging import Logging as LiteLLMLoggingObj
 from litellm.types.llms.openai import AllEmbeddingInputValues, AllMessageValues
 from litellm.types.utils import EmbeddingResponse
-from litellm.utils import is_base64_encoded
 
-from ..common_utils import RemodlaiEmbeddingsError
+from ..common_utils import RemodlaiEmbeddingsError, get_remodlai_embeddings_secrets
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # orjson ships with the `proxy` extra
+    _json_loads = json.loads  # type: ignore
+
+# (model, dimensions) pairs already warned about for untruncated vectors
+_warned_untruncated_dimensions: Set[Tuple[str, int]] = set()
+
+# Nova-specific request params, passed through to the API as-is
+_NOVA_PARAMS: FrozenSet[str] = frozenset(
+    {
+        "task",
+        "return_multivector",
+        "instructions",
+        "adapter",
+        "image",
+        "image_embeds",
+    }
+)
+# litellm-side params, consumed by the handler and never sent to the API
+_LITELLM_PARAMS: FrozenSet[str] = frozenset({"batch_size"})
+_PASSTHROUGH_PARAMS: FrozenSet[str] = (
+    _NOVA_PARAMS | _LITELLM_PARAMS | {"dimensions", "encoding_format"}
+)
+_SUPPORTED_OPENAI_PARAMS: Tuple[str, ...] = (
+    "input",
+    "model",
+    "encoding_format",
+    "dimensions",
+    *sorted(_NOVA_PARAMS),
+    *sorted(_LITELLM_PARAMS),
+)
+
+
+# `data:<mediatype>,<base64 payload>[,...]` - same rule as
+# `litellm.utils.is_base64_encoded` (only the segment after the first comma is
+# checked), in a single compiled scan instead of a decode/re-encode round trip
+_BASE64_DATA_URI_RE = re.compile(
+    r"data:[^,]*,([A-Za-z0-9+/]*)(={0,2})(?:,.*)?", re.DOTALL
+)
+# a padded payload only re-encodes to itself when the unused low bits of its
+# last character are zero; these are the characters allowed before "=" / "=="
+_CANONICAL_PADDED_LAST_CHARS = {
+    1: frozenset("AEIMQUYcgkosw048"),
+    2: frozenset("AQgw"),
+}
+
+
+def _is_base64_encoded(value: str) -> bool:
+    match = _BASE64_DATA_URI_RE.fullmatch(value)
+    if match is None:
+        return False
+    payload, padding = match.group(1), match.group(2)
+    if (len(payload) + len(padding)) % 4:
+        return False
+    return not padding or (
+        payload != "" and payload[-1] in _CANONICAL_PADDED_LAST_CHARS[len(padding)]
+    )
 
 
 class RemodlaiEmbeddingsConfig(BaseEmbeddingConfig):
@@ -26,14 +89,6 @@ class RemodlaiEmbeddingsConfig(BaseEmbeddingConfig):
     Based on Jina Embeddings V4 architecture.
     """
 
-    def __init__(
-        self,
-    ) -> None:
-        locals_ = locals().copy()
-        for key, value in locals_.items():
-            if key != "self" and value is not None:
-                setattr(self.__class__, key, value)
-
     @classmethod
     def get_config(cls):
         return {
@@ -53,7 +108,7 @@ class RemodlaiEmbeddingsConfig(BaseEmbeddingConfig):
         }
 
     def get_supported_openai_params(self, model: str) -> List[str]:
-        return ["dimensions"]
+        return list(_SUPPORTED_OPENAI_PARAMS)
 
     def map_openai_params(
         self,
@@ -62,8 +117,8 @@ class RemodlaiEmbeddingsConfig(BaseEmbeddingConfig):
         model: str,
         drop_params: bool,
     ) -> dict:
-        if "dimensions" in non_default_params:
-            optional_params["dimensions"] = non_default_params["dimensions"]
+        for param in _PASSTHROUGH_PARAMS.intersection(non_default_params):
+            optional_params[param] = non_default_params[param]
         return optional_params
 
     def _get_openai_compatible_provider_info(
@@ -78,8 +133,9 @@ class RemodlaiEmbeddingsConfig(BaseEmbeddingConfig):
                 - api_base: str
                 - dynamic_api_key: str
         """
-        api_base = api_base or get_secret_str("REMODLAI_EMBEDDINGS_API_BASE")
-        dynamic_api_key = api_key or get_secret_str("REMODLAI_EMBEDDINGS_API_KEY") or "fake-api-key"
+        secret_api_base, secret_api_key = get_remodlai_embeddings_secrets()
+        api_base = api_base or secret_api_base
+        dynamic_api_key = api_key or secret_api_key or "fake-api-key"
         return LlmProviders.REMODLAI_EMBEDDINGS.value, api_base, dynamic_api_key
 
     def get_complete_url(
@@ -91,9 +147,11 @@ class RemodlaiEmbeddingsConfig(BaseEmbeddingConfig):
         litellm_params: dict,
         stream: Optional[bool] = None,
     ) -> str:
-        if not api_base:
-            raise ValueError("api_base must be provided for Remodl AI Embeddings")
-        return f"{api_base}/embeddings"
+        return get_remodlai_complete_url(
+            api_base or get_remodlai_embeddings_secrets()[0],
+            "REMODLAI_EMBEDDINGS_API_BASE",
+            "embeddings",
+        )
 
     def transform_embedding_request(
         self,
@@ -103,19 +161,32 @@ class RemodlaiEmbeddingsConfig(BaseEmbeddingConfig):
         headers: dict,
     ) -> dict:
         data = {"model": model, **optional_params}
+        # fast path - plain text batches can't contain a base64 data URI
+        if isinstance(input, list) and all(
+            isinstance(x, str) and not x.startswith("data:") for x in input
+        ):
+            data["input"] = input
+            return data
+
         input = cast(List[str], input) if isinstance(input, List) else [input]
-        if any((is_base64_encoded(x) for x in input)):
-            transformed_input = []
-            for value in input:
-                if isinstance(value, str):
-                    if is_base64_encoded(value):
-                        img_data = value.split(",")[1]
-                        transformed_input.append({"image": img_data})
-                    else:
-                        transformed_input.append({"text": value})
-            data["input"] = transformed_input
-        else:
+        # classify each input once; None marks non-string (already structured) items
+        is_image = [
+            _is_base64_encoded(x) if isinstance(x, str) else None for x in input
+        ]
+        if not any(is_image):
             data["input"] = input
+            return data
+
+        transformed_input: List[Union[str, dict, None]] = [None] * len(input)
+        for index, (value, value_is_image) in enumerate(zip(input, is_image)):
+            if value_is_image is None:
+                transformed_input[index] = value
+            elif value_is_image:
+                img_data = value.split(",", 2)[1]
+                transformed_input[index] = {"image": img_data}
+            else:
+                transformed_input[index] = {"text": value}
+        data["input"] = transformed_input
         return data
 
     def transform_embedding_response(
@@ -129,7 +200,8 @@ class RemodlaiEmbeddingsConfig(BaseEmbeddingConfig):
         optional_params: dict,
         litellm_params: dict,
     ) -> EmbeddingResponse:
-        response_json = raw_response.json()
+        # parse straight from bytes - multivector responses can be several MB of floats
+        response_json = _json_loads(raw_response.content)
         ## LOGGING
         logging_obj.post_call(
             input=input,
@@ -137,8 +209,33 @@ class RemodlaiEmbeddingsConfig(BaseEmbeddingConfig):
             additional_args={"complete_input_dict": request_data},
             original_response=response_json,
         )
+        self._check_dimensions(model, response_json, optional_params)
         return EmbeddingResponse(**response_json)
 
+    @staticmethod
+    def _check_dimensions(model: str, response_json: dict, optional_params: dict):
+        """
+        Nova truncates Matryoshka embeddings server-side when `dimensions` is sent.
+        Warn once if it returned longer vectors, i.e. the full vector went over the wire.
+        """
+        dimensions = optional_params.get("dimensions")
+        if not dimensions or optional_params.get("return_multivector"):
+            return
+        data = response_json.get("data") or []
+        embedding = data[0].get("embedding") if data else None
+        if not isinstance(embedding, list) or len(embedding) <= dimensions:
+            return
+        if (model, dimensions) in _warned_untruncated_dimensions:
+            return
+        _warned_untruncated_dimensions.add((model, dimensions))
+        verbose_logger.warning(
+            "Remodl AI embeddings: requested dimensions=%s but model=%s returned %s-d vectors. "
+            "Check the server applies Matryoshka truncation.",
+            dimensions,
+            model,
+            len(embedding),
+        )
+
     def validate_environment(
         self,
         headers: dict,
@@ -151,6 +248,7 @@ class RemodlaiEmbeddingsConfig(BaseEmbeddingConfig):
     ) -> dict:
         default_headers = {
             "Content-Type": "application/json",
+            "Connection": "keep-alive",
         }
         if api_key:
             default_headers["Authorization"] = f"Bearer {api_key}"
@@ -180,6 +180,7 @@ from .llms.openai_like.embedding.handler import OpenAILikeEmbeddingHandler
 from .llms.ovhcloud.chat.transformation import OVHCloudChatConfig
 from .llms.petals.completion import handler as petals_handler
 from .llms.predibase.chat.handler import PredibaseChatCompletion
+from .llms.remodlai_embeddings.embedding.handler import RemodlaiEmbeddingsHandler
 from .llms.replicate.chat.handler import completion as replicate_chat_completion
 from .llms.sagemaker.chat.handler import SagemakerChatHandler
 from .llms.sagemaker.completion.handler import SagemakerLLM
@@ -269,6 +270,7 @@ watsonx_chat_completion = WatsonXChatHandler()
 openai_like_embedding = OpenAILikeEmbeddingHandler()
 openai_like_chat_completion = OpenAILikeChatHandler()
 databricks_embedding = DatabricksEmbeddingHandler()
+remodlai_embeddings_handler = RemodlaiEmbeddingsHandler()
 base_llm_http_handler = BaseLLMHTTPHandler()
 base_llm_aiohttp_handler = BaseLLMAIOHTTPHandler()
 sagemaker_chat_completion = SagemakerChatHandler()
@@ -4681,10 +4683,9 @@ def embedding(  # noqa: PLR0915
                 transformed_input = [input]
             else:
                 transformed_input = input
-            response = base_llm_http_handler.embedding(
+            response = remodlai_embeddings_handler.embedding(
                 model=model,
                 input=transformed_input,
-                custom_llm_provider=custom_llm_provider,
                 api_base=api_base,
                 api_key=api_key,
                 logging_obj=logging,
@@ -7,59 +7,31 @@ Run this after starting the proxy to register the nova-embeddings-v1 models.
 import litellm
 
 # Register nova-embeddings-v1 models
+_base_model_info = {
+    "input_cost_per_token": 0.0,
+    "output_cost_per_token": 0.0,
+    "litellm_provider": "remodlai",
+    "mode": "embedding",
+    "max_input_tokens": 8192,
+    "max_tokens": 8192,
+    "output_vector_size": 128,
+    "supports_embedding_image_input": True,
+}
+
+_model_notes = (
+    (
+        "remodlai/nova-embeddings-v1",
+        "Nova Embeddings V1: Industry-first multimodal multi-vector embeddings with runtime instruction tuning. Supports text, images, code. Task adapters: retrieval, text-matching, code. Dense (pooled up to 2048d) or multivector (128d per token).",
+    ),
+    (
+        "remodlai/remodlai/nova-embeddings-v1",
+        "Local SDK version. Alias for remodlai/nova-embeddings-v1.",
+    ),
+)
+
 nova_embedding_models = {
-    "remodlai/nova-embeddings-v1": {
-        "input_cost_per_token": 0.0,
-        "output_cost_per_token": 0.0,
-        "litellm_provider": "remodlai",
-        "mode": "embedding",
-        "max_input_tokens": 8192,
-        "max_tokens": 8192,
-        "output_vector_size": 128,
-        "supports_embedding_image_input": True,
-        "metadata": {
-            "notes": "Multivector, multimodal embedding model. Alias for remodlai/nova-embeddings-v1."
-        }
-    },
-    "remodlai/remodlai/nova-embeddings-v1": {
-        "input_cost_per_token": 0.0,
-        "output_cost_per_token": 0.0,
-        "litellm_provider": "remodlai",
-        "mode": "embedding",
-        "max_input_tokens": 8192,
-        "max_tokens": 8192,
-        "output_vector_size": 128,
-        "supports_embedding_image_input": True,
-        "metadata": {
-            "notes": "Nova Embeddings V1: Industry-first multimodal multi-vector embeddings with runtime instruction tuning. Supports text, images, code. Task adapters: retrieval, text-matching, code. Dense (pooled up to 2048d) or multivector (128d per token)."
-        }
-    },
-    "remodlai/nova-embeddings-v1": {
-        "input_cost_per_token": 0.0,
-        "output_cost_per_token": 0.0,
-        "litellm_provider": "remodlai",
-        "mode": "embedding",
-        "max_input_tokens": 8192,
-        "max_tokens": 8192,
-        "output_vector_size": 128,
-        "supports_embedding_image_input": True,
-        "metadata": {
-            "notes": "Local SDK version. Alias for remodlai/nova-embeddings-v1."
-        }
-    },
-    "remodlai/remodlai/nova-embeddings-v1": {
-        "input_cost_per_token": 0.0,
-        "output_cost_per_token": 0.0,
-        "litellm_provider": "remodlai",
-        "mode": "embedding",
-        "max_input_tokens": 8192,
-        "max_tokens": 8192,
-        "output_vector_size": 128,
-        "supports_embedding_image_input": True,
-        "metadata": {
-            "notes": "Local SDK version. Multivector, multimodal embedding model."
-        }
-    }
+    model_name: dict(_base_model_info, metadata={"notes": notes})
+    for model_name, notes in _model_notes
 }
 
 # Register the models
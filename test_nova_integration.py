@@ -1,8 +1,7 @@
-#!/usr/bin/env python3
 """
 Test Nova Embeddings V1 Integration with LiteLLM
 
-This script tests the complete Nova integration:
+These tests exercise the complete Nova integration:
 1. Provider registration
 2. Task-based routing
 3. Multimodal inputs
@@ -13,196 +12,315 @@ Prerequisites:
 - LiteLLM proxy running on port 4000
 - Nova server configured with adapters
 - Environment variables set (REMODL_AI_API_BASE, etc.)
+
+Run with:
+  pytest -m integration test_nova_integration.py
 """
 
-import requests
-import json
-from typing import Dict, Any
+import asyncio
+import hashlib
+import warnings
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+import httpx
+import pytest
+import pytest_asyncio
+
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+
+    def _dumps_sorted(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+
+except ImportError:  # orjson ships with the proxy extra only
+    import json
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    def _dumps_sorted(obj: Any) -> bytes:
+        return json.dumps(obj, sort_keys=True).encode()
+
+    _loads = json.loads
+
+try:
+    import uvloop
+except ImportError:  # uvloop ships with the proxy extra only, and not on Windows
+    uvloop = None
+
+pytestmark = pytest.mark.integration
+
+PROXY_BASE_URL = "http://localhost:4000"
+PROXY_HEADERS = {
+    "Authorization": "Bearer sk-1234",
+    "Content-Type": "application/json",
+}
+
+TEST_IMAGE_URL = "https://media.eagereyes.org/wp-content/uploads/2016/05/pie-package-teaser.png"
+
+# image URL -> sha256 of the image bytes, LRU-evicted
+_IMG_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_IMG_CACHE_MAX_SIZE = 128
+
+
+async def image_item(url: str) -> Dict[str, str]:
+    """
+    Build an image input item carrying a content hash of the image bytes, so
+    the server can reuse a previously encoded image instead of re-running the
+    vision encoder
+    """
+    mm_hash = _IMG_CACHE.get(url)
+    if mm_hash is not None:
+        _IMG_CACHE.move_to_end(url)
+    else:
+        try:
+            async with httpx.AsyncClient(timeout=30) as fetcher:
+                response = await fetcher.get(url)
+                response.raise_for_status()
+        except httpx.HTTPError as e:
+            # a third-party outage says nothing about the proxy
+            pytest.skip(f"Could not fetch test image {url}: {e}")
+        mm_hash = hashlib.sha256(response.content).hexdigest()
+        _IMG_CACHE[url] = mm_hash
+        if len(_IMG_CACHE) > _IMG_CACHE_MAX_SIZE:
+            _IMG_CACHE.popitem(last=False)
+    return {"image": url, "mm_hash": mm_hash}
+
+
+@lru_cache(maxsize=256)
+def prompt_prefix_hash(instructions: str) -> str:
+    """
+    sha256 of a stable instructions prefix, sent so the server can look up
+    its prompt-prefix cache directly
+    """
+    return hashlib.sha256(instructions.encode()).hexdigest()
+
+
+def dedup(inputs: list) -> Tuple[list, List[int]]:
+    """
+    Collapse identical input items (compared by sha256 of their canonical
+    JSON) and return the unique items plus, for every original position, the
+    index of its unique item
+    """
+    positions: Dict[str, int] = {}
+    unique: list = []
+    index_map: List[int] = []
+    for item in inputs:
+        key = hashlib.sha256(_dumps_sorted(item)).hexdigest()
+        if key not in positions:
+            positions[key] = len(unique)
+            unique.append(item)
+        index_map.append(positions[key])
+    return unique, index_map
 
 
-def test_request(
+async def embed(
+    client: httpx.AsyncClient,
     task: str,
     input_data: list,
     instructions: str = None,
     return_multivector: bool = False,
     dimensions: int = None,
+    read_body: bool = True,
 ) -> Dict[str, Any]:
     """
-    Make a test embedding request to the proxy
+    Make a test embedding request to the proxy, sending each distinct input
+    only once and fanning the results back out to the original positions.
+
+    With read_body=False a successful response body is never downloaded or
+    decoded - use it for probes that only check status and headers.
     """
+    unique_inputs, index_map = dedup(input_data)
     payload = {
         "model": "nova-embeddings-v1",
         "task": task,
-        "input": input_data,
+        "input": unique_inputs,
     }
+    headers = {}
     
     if instructions:
         payload["instructions"] = instructions
+        headers["x-prompt-prefix-sha256"] = prompt_prefix_hash(instructions)
     if return_multivector is not None:
         payload["return_multivector"] = return_multivector
     if dimensions:
         payload["dimensions"] = dimensions
     
-    response = requests.post(
-        "http://localhost:4000/v1/embeddings",
-        headers={
-            "Authorization": "Bearer sk-1234",
-            "Content-Type": "application/json",
-        },
-        json=payload,
+    request = client.build_request(
+        "POST", "/v1/embeddings", content=_dumps(payload), headers=headers
     )
+    response = await client.send(request, stream=True)
     
+    try:
+        if response.status_code != 200:
+            await response.aread()
+            body = response.text
+        elif not read_body:
+            body = None
+        else:
+            body = _loads(await response.aread())
+            data = body["data"]
+            body["data"] = [
+                {**data[unique_idx], "index": idx}
+                for idx, unique_idx in enumerate(index_map)
+            ]
+    finally:
+        await response.aclose()
+
     return {
         "status_code": response.status_code,
         "headers": dict(response.headers),
-        "body": response.json() if response.status_code == 200 else response.text,
+        "body": body,
     }
 
 
-def main():
-    print("=" * 80)
-    print("Nova Embeddings V1 Integration Test")
-    print("=" * 80)
-    
-    # Test 1: Basic Retrieval
-    print("\n[Test 1] Basic Retrieval Task")
-    print("-" * 80)
-    result = test_request(
-        task="retrieval",
-        input_data=["test query", "test document"],
-    )
-    print(f"Status: {result['status_code']}")
-    print(f"Routed to: {result['headers'].get('x-litellm-model-id')}")
-    if result['status_code'] == 200:
-        print(f"Embeddings: {len(result['body']['data'])} vectors")
-        print(f"Dimensions: {len(result['body']['data'][0]['embedding'])}")
-        print("✅ PASS")
-    else:
-        print(f"❌ FAIL: {result['body']}")
-    
-    # Test 2: Retrieval with Query Subtask
-    print("\n[Test 2] Retrieval.Query Subtask")
-    print("-" * 80)
-    result = test_request(
-        task="retrieval.query",
-        input_data=[{"text": "search for legal cases"}],
-        instructions="Focus on legal precedents and case citations",
-    )
-    print(f"Status: {result['status_code']}")
-    print(f"Routed to: {result['headers'].get('x-litellm-model-id')}")
-    if result['status_code'] == 200:
-        print("✅ PASS - Routed to retrieval adapter")
-    else:
-        print(f"❌ FAIL: {result['body']}")
-    
-    # Test 3: Retrieval.Passage with Image
-    print("\n[Test 3] Multimodal Retrieval.Passage")
-    print("-" * 80)
-    result = test_request(
+@pytest.fixture(scope="module")
+def event_loop():
+    loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="module")
+async def nova_client():
+    """
+    One pooled client shared by every test in the module, so probes reuse its
+    keep-alive connections. Skips the module when the proxy isn't reachable.
+    """
+    async with httpx.AsyncClient(
+        base_url=PROXY_BASE_URL,
+        headers=PROXY_HEADERS,
+        timeout=30,
+        limits=httpx.Limits(max_keepalive_connections=10),
+    ) as client:
+        try:
+            await client.get("/health/liveliness")
+        except httpx.ConnectError:
+            pytest.skip(
+                f"Could not connect to proxy at {PROXY_BASE_URL}. Make sure the "
+                "proxy is running: poetry run litellm --config proxy_server_config.yaml"
+            )
+        yield client
+
+
+async def _multimodal_probe(client: httpx.AsyncClient) -> Dict[str, Any]:
+    return await embed(
+        client,
         task="retrieval.passage",
         input_data=[
-            {
-                "image": "https://media.eagereyes.org/wp-content/uploads/2016/05/pie-package-teaser.png"
-            },
-            {
-                "text": "Chart showing data distribution"
-            }
+            await image_item(TEST_IMAGE_URL),
+            {"text": "Chart showing data distribution"},
         ],
         instructions="Analyze chart layout and extract key data points",
         return_multivector=True,
     )
-    print(f"Status: {result['status_code']}")
-    print(f"Routed to: {result['headers'].get('x-litellm-model-id')}")
-    if result['status_code'] == 200:
-        embeddings = result['body']['data']
-        print(f"Image embedding shape: {type(embeddings[0]['embedding'])}")
-        print(f"Text embedding shape: {type(embeddings[1]['embedding'])}")
-        print("✅ PASS - Multimodal with multivector")
-    else:
-        print(f"❌ FAIL: {result['body']}")
-    
-    # Test 4: Text Matching
-    print("\n[Test 4] Text Matching Task")
-    print("-" * 80)
-    result = test_request(
-        task="text-matching",
-        input_data=["Text A for comparison", "Text B for comparison"],
-    )
-    print(f"Status: {result['status_code']}")
-    print(f"Routed to: {result['headers'].get('x-litellm-model-id')}")
-    expected_model = "nova-embeddings-text-matching"
-    if result['status_code'] == 200:
-        actual_model = result['headers'].get('x-litellm-model-id')
-        if actual_model == expected_model:
-            print(f"✅ PASS - Correctly routed to {expected_model}")
-        else:
-            print(f"❌ FAIL - Expected {expected_model}, got {actual_model}")
-    else:
-        print(f"❌ FAIL: {result['body']}")
-    
-    # Test 5: Code Task
-    print("\n[Test 5] Code Task")
-    print("-" * 80)
-    result = test_request(
-        task="code.query",
-        input_data=[{"text": "function to parse JSON"}],
-        instructions="Focus on function purpose, ignore variable names",
-    )
-    print(f"Status: {result['status_code']}")
-    print(f"Routed to: {result['headers'].get('x-litellm-model-id')}")
-    expected_model = "nova-embeddings-code"
-    if result['status_code'] == 200:
-        actual_model = result['headers'].get('x-litellm-model-id')
-        if actual_model == expected_model:
-            print(f"✅ PASS - Correctly routed to {expected_model}")
-        else:
-            print(f"❌ FAIL - Expected {expected_model}, got {actual_model}")
-    else:
-        print(f"❌ FAIL: {result['body']}")
-    
-    # Test 6: Dense vs Multivector
-    print("\n[Test 6] Dense (Pooled) with Matryoshka")
-    print("-" * 80)
-    result = test_request(
-        task="retrieval",
-        input_data=["test document"],
-        return_multivector=False,
-        dimensions=512,
+
+
+@pytest_asyncio.fixture(scope="module")
+async def probe_results(nova_client) -> Dict[str, Any]:
+    """
+    Fire all six probes once, concurrently over the shared pooled client.
+
+    return_exceptions=True keeps one failing probe from masking the others -
+    each test re-raises only its own probe's error (or skip).
+    """
+    probes = {
+        "retrieval": embed(
+            nova_client,
+            task="retrieval",
+            input_data=["test query", "test document"],
+        ),
+        "retrieval_query": embed(
+            nova_client,
+            task="retrieval.query",
+            input_data=[{"text": "search for legal cases"}],
+            instructions="Focus on legal precedents and case citations",
+            read_body=False,
+        ),
+        "retrieval_passage_multimodal": _multimodal_probe(nova_client),
+        "text_matching": embed(
+            nova_client,
+            task="text-matching",
+            input_data=["Text A for comparison", "Text B for comparison"],
+            read_body=False,
+        ),
+        "code_query": embed(
+            nova_client,
+            task="code.query",
+            input_data=[{"text": "function to parse JSON"}],
+            instructions="Focus on function purpose, ignore variable names",
+            read_body=False,
+        ),
+        "dense_matryoshka_dimensions": embed(
+            nova_client,
+            task="retrieval",
+            input_data=["test document"],
+            return_multivector=False,
+            dimensions=512,
+        ),
+    }
+    results = await asyncio.gather(*probes.values(), return_exceptions=True)
+    return dict(zip(probes, results))
+
+
+def _probe_result(probe_results: Dict[str, Any], name: str) -> Dict[str, Any]:
+    result = probe_results[name]
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+def test_retrieval(probe_results):
+    """Basic retrieval task"""
+    result = _probe_result(probe_results, "retrieval")
+
+    assert result["status_code"] == 200, result["body"]
+    assert len(result["body"]["data"]) == 2
+
+
+def test_retrieval_query(probe_results):
+    """retrieval.query subtask with instructions routes to the retrieval adapter"""
+    result = _probe_result(probe_results, "retrieval_query")
+
+    assert result["status_code"] == 200, result["body"]
+
+
+def test_retrieval_passage_multimodal(probe_results):
+    """Multimodal retrieval.passage with multivector output"""
+    result = _probe_result(probe_results, "retrieval_passage_multimodal")
+
+    assert result["status_code"] == 200, result["body"]
+    assert len(result["body"]["data"]) == 2
+
+
+def test_text_matching(probe_results):
+    """text-matching routes to the text-matching deployment"""
+    result = _probe_result(probe_results, "text_matching")
+
+    assert result["status_code"] == 200, result["body"]
+    assert (
+        result["headers"].get("x-litellm-model-id") == "nova-embeddings-text-matching"
     )
-    print(f"Status: {result['status_code']}")
-    if result['status_code'] == 200:
-        dims = len(result['body']['data'][0]['embedding'])
-        if dims == 512:
-            print(f"✅ PASS - Matryoshka truncation to {dims} dimensions")
-        else:
-            print(f"⚠️  WARNING - Expected 512 dims, got {dims}")
-    else:
-        print(f"❌ FAIL: {result['body']}")
-    
-    print("\n" + "=" * 80)
-    print("Test Summary")
-    print("=" * 80)
-    print("\nIf all tests passed:")
-    print("✅ Nova Embeddings V1 is fully integrated!")
-    print("✅ Task-based routing is working")
-    print("✅ Multimodal inputs are supported")
-    print("✅ Instructions are being passed through")
-    print("✅ Multivector and dense modes work")
-    print("\nNext steps:")
-    print("- Add your Nova models to the Model Hub in the UI")
-    print("- Configure environment variables")
-    print("- Start using Nova's instruction tuning for domain adaptation!")
-
-
-if __name__ == "__main__":
-    try:
-        main()
-    except requests.exceptions.ConnectionError:
-        print("\n❌ ERROR: Could not connect to proxy at http://localhost:4000")
-        print("Make sure the proxy is running:")
-        print("  poetry run litellm --config proxy_server_config.yaml")
-    except Exception as e:
-        print(f"\n❌ ERROR: {e}")
-        import traceback
-        traceback.print_exc()
 
+
+def test_code_query(probe_results):
+    """code.query routes to the code deployment"""
+    result = _probe_result(probe_results, "code_query")
+
+    assert result["status_code"] == 200, result["body"]
+    assert result["headers"].get("x-litellm-model-id") == "nova-embeddings-code"
+
+
+def test_dense_matryoshka_dimensions(probe_results):
+    """Dense (pooled) output with matryoshka truncation"""
+    result = _probe_result(probe_results, "dense_matryoshka_dimensions")
+
+    assert result["status_code"] == 200, result["body"]
+    dims = len(result["body"]["data"][0]["embedding"])
+    if dims != 512:
+        warnings.warn(f"Expected 512 dims, got {dims}")
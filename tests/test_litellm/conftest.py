@@ -1,14 +1,13 @@
 # conftest.py
 
 import importlib
-import os
+import pathlib
 import sys
 
 import pytest
 
-sys.path.insert(
-    0, os.path.abspath("../..")
-)  # Adds the parent directory to the system path
+# Adds the repo root to the system path, independent of the working directory
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
 import asyncio
 
 import litellm
@@ -31,11 +30,6 @@ def setup_and_teardown():
     """
     This fixture reloads litellm before every function. To speed up testing by removing callbacks being chained.
     """
-    curr_dir = os.getcwd()  # Get the current working directory
-    sys.path.insert(
-        0, os.path.abspath("../..")
-    )  # Adds the project directory to the system path
-
     import litellm
     from litellm import Router
 
@@ -1,15 +1,10 @@
 import json
-import os
-import sys
-from unittest.mock import AsyncMock, MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, Mock
 
 import httpx
 import pytest
 
-sys.path.insert(
-    0, os.path.abspath("../../../../..")
-)  # Adds the parent directory to the system path
-
 from litellm.llms.remodlai.chat.transformation import RemodlAIChatConfig
 
 
@@ -45,47 +40,61 @@ def test_remodlai_chat_transformation_file_url():
     ]
 
 
-def test_remodlai_chat_transformation_with_audio_url():
-    from litellm import completion
-    from litellm.llms.custom_httpx.http_handler import HTTPHandler
+@pytest.fixture(scope="module")
+def stub_client():
+    """
+    Minimal stand-in for an OpenAI client - only the attributes the chat
+    completion path touches.
+    """
+    return SimpleNamespace(
+        api_key="sk-test",
+        _base_url=SimpleNamespace(_uri_reference="https://api.example.com/v1"),
+        chat=SimpleNamespace(
+            completions=SimpleNamespace(
+                with_raw_response=SimpleNamespace(
+                    create=Mock(return_value=MagicMock())
+                )
+            )
+        ),
+    )
 
-    client = MagicMock()
 
-    with patch.object(
-        client.chat.completions.with_raw_response, "create", return_value=MagicMock()
-    ) as mock_post:
-        try:
-            response = completion(
-                model="remodlai/llama-3.1-70b-instruct",
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "audio_url",
-                                "audio_url": {"url": "https://example.com/audio.mp3"},
-                            },
-                        ],
-                    },
-                ],
-                client=client,
-            )
-        except Exception as e:
-            print(f"Error: {e}")
+def test_remodlai_chat_transformation_with_audio_url(stub_client):
+    from litellm import completion
 
-        mock_post.assert_called_once()
-        print(f"mock_post.call_args.kwargs: {mock_post.call_args.kwargs}")
-        assert mock_post.call_args.kwargs["messages"] == [
-            {
-                "role": "user",
-                "content": [
-                    {
-                        "type": "audio_url",
-                        "audio_url": {"url": "https://example.com/audio.mp3"},
-                    }
-                ],
-            }
-        ]
+    mock_post = stub_client.chat.completions.with_raw_response.create
+    try:
+        response = completion(
+            model="remodlai/llama-3.1-70b-instruct",
+            messages=[
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "audio_url",
+                            "audio_url": {"url": "https://example.com/audio.mp3"},
+                        },
+                    ],
+                },
+            ],
+            client=stub_client,
+        )
+    except Exception as e:
+        print(f"Error: {e}")
+
+    mock_post.assert_called_once()
+    print(f"mock_post.call_args.kwargs: {mock_post.call_args.kwargs}")
+    assert mock_post.call_args.kwargs["messages"] == [
+        {
+            "role": "user",
+            "content": [
+                {
+                    "type": "audio_url",
+                    "audio_url": {"url": "https://example.com/audio.mp3"},
+                }
+            ],
+        }
+    ]
 
 
 def test_remodlai_supports_reasoning_effort():
@@ -101,4 +110,3 @@ def test_remodlai_supports_reasoning_effort():
         drop_params=False,
     )
     assert optional_params["reasoning_effort"] == "high"
-
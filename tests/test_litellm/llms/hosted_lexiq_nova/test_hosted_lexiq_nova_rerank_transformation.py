@@ -1,6 +1,3 @@
-import os
-import sys
-
 import pytest
 
 from litellm.llms.remodlai.rerank.transformation import RemodlAIRerankConfig
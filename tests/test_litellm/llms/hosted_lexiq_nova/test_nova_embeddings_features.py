@@ -6,154 +6,135 @@ Test Nova Embeddings V1 special features:
 - Multimodal support (text + images)
 - Matryoshka dimensions
 """
-import os
-import sys
+import itertools
 
 import pytest
 
-sys.path.insert(
-    0, os.path.abspath("../../../..")
-)  # Adds the parent directory to the system path
-
-from litellm.llms.remodlai.embedding.transformation import (
-    RemodlAIEmbeddingConfig,
+from litellm.llms.remodlai_embeddings.embedding.transformation import (
+    RemodlaiEmbeddingsConfig,
 )
 
 
+_CFG = RemodlaiEmbeddingsConfig()
+_MODEL = "remodlai/nova-embeddings-v1"
+_SUPPORTED = frozenset(_CFG.get_supported_openai_params(_MODEL))
+
+
 class TestNovaEmbeddingsFeatures:
     """Test Nova Embeddings V1 unique capabilities"""
 
-    def setup_method(self):
-        self.config = RemodlAIEmbeddingConfig()
-        self.model = "remodlai/nova-embeddings-v1"
-
     def test_supported_params_include_nova_features(self):
         """Verify all Nova-specific parameters are supported"""
-        supported = self.config.get_supported_openai_params(self.model)
-        
-        # Standard OpenAI params
-        assert "input" in supported
-        assert "model" in supported
-        assert "encoding_format" in supported
-        assert "dimensions" in supported
-        
-        # Nova-specific params
-        assert "task" in supported
-        assert "return_multivector" in supported
-        assert "instructions" in supported
-        assert "adapter" in supported
-        assert "image" in supported
-        assert "image_embeds" in supported
-
-    def test_map_params_handles_instructions(self):
-        """Test that runtime instructions are properly passed through"""
-        non_default_params = {
-            "instructions": "Focus on legal precedents and case citations",
-            "task": "retrieval",
-        }
-        optional_params = {}
-        
-        result = self.config.map_openai_params(
-            non_default_params=non_default_params,
-            optional_params=optional_params,
-            model=self.model,
-            drop_params=False,
-        )
-        
-        assert "instructions" in result
-        assert result["instructions"] == "Focus on legal precedents and case citations"
-        assert "task" in result
-        assert result["task"] == "retrieval"
-
-    def test_map_params_handles_multivector_mode(self):
-        """Test multivector vs dense mode parameters"""
-        # Multivector mode (token-level embeddings)
-        multivector_params = {
-            "task": "retrieval",
-            "return_multivector": True,
-        }
-        optional_params = {}
-        
-        result = self.config.map_openai_params(
-            non_default_params=multivector_params,
-            optional_params=optional_params,
-            model=self.model,
-            drop_params=False,
-        )
-        
-        assert result["return_multivector"] is True
-        
-        # Dense mode with matryoshka dimensions
-        dense_params = {
-            "task": "retrieval",
-            "return_multivector": False,
-            "dimensions": 512,
-        }
-        optional_params = {}
-        
-        result = self.config.map_openai_params(
-            non_default_params=dense_params,
-            optional_params=optional_params,
-            model=self.model,
-            drop_params=False,
-        )
-        
-        assert result["return_multivector"] is False
-        assert result["dimensions"] == 512
+        assert {
+            # Standard OpenAI params
+            "input",
+            "model",
+            "encoding_format",
+            "dimensions",
+            # Nova-specific params
+            "task",
+            "return_multivector",
+            "instructions",
+            "adapter",
+            "image",
+            "image_embeds",
+        } <= _SUPPORTED
 
-    def test_map_params_handles_task_adapters(self):
-        """Test task and adapter parameters"""
-        params = {
-            "task": "code",
-            "adapter": "code",
-        }
-        optional_params = {}
-        
-        result = self.config.map_openai_params(
-            non_default_params=params,
-            optional_params=optional_params,
-            model=self.model,
+    @pytest.mark.parametrize(
+        "nd_params, expected",
+        [
+            # runtime instructions
+            (
+                {
+                    "instructions": "Focus on legal precedents and case citations",
+                    "task": "retrieval",
+                },
+                {
+                    "instructions": "Focus on legal precedents and case citations",
+                    "task": "retrieval",
+                },
+            ),
+            # multivector mode (token-level embeddings)
+            (
+                {"task": "retrieval", "return_multivector": True},
+                {"return_multivector": True},
+            ),
+            # dense mode with matryoshka dimensions
+            (
+                {"task": "retrieval", "return_multivector": False, "dimensions": 512},
+                {"return_multivector": False, "dimensions": 512},
+            ),
+            # task adapters
+            (
+                {"task": "code", "adapter": "code"},
+                {"task": "code", "adapter": "code"},
+            ),
+            # multimodal (images)
+            (
+                {"task": "retrieval", "image": "https://example.com/diagram.png"},
+                {"image": "https://example.com/diagram.png"},
+            ),
+        ],
+    )
+    def test_map_openai_params(self, nd_params, expected):
+        """Nova-specific params are passed through unchanged"""
+        result = _CFG.map_openai_params(
+            non_default_params=nd_params,
+            optional_params={},
+            model=_MODEL,
             drop_params=False,
         )
-        
-        assert result["task"] == "code"
-        assert result["adapter"] == "code"
 
-    def test_map_params_handles_multimodal(self):
-        """Test multimodal parameters (images)"""
-        params = {
-            "task": "retrieval",
-            "image": "https://example.com/diagram.png",
+        assert expected.items() <= result.items()
+
+    def test_map_openai_params_preserves_nova_keys(self):
+        """Every combination of Nova params is passed through verbatim"""
+        values = {
+            "instructions": [None, "", "Fokus auf Präzedenzfälle ⚖️"],
+            "task": [
+                "retrieval",
+                "retrieval.query",
+                "retrieval.passage",
+                "text-matching",
+                "code",
+            ],
+            "return_multivector": [None, True, False],
+            "dimensions": [0, 128, 1024],
+            "adapter": ["retrieval", "code"],
+            "image": ["https://example.com/diagram.png"],
         }
-        optional_params = {}
-        
-        result = self.config.map_openai_params(
-            non_default_params=params,
-            optional_params=optional_params,
-            model=self.model,
-            drop_params=False,
-        )
-        
-        assert "image" in result
-        assert result["image"] == "https://example.com/diagram.png"
+        for combination in itertools.product(*values.values()):
+            params = dict(zip(values, combination))
+            result = _CFG.map_openai_params(
+                non_default_params=params,
+                optional_params={},
+                model=_MODEL,
+                drop_params=False,
+            )
+
+            assert result == params
 
     def test_complete_url_generation(self):
         """Test API endpoint URL generation"""
         # Should create the /v1/embeddings endpoint
-        url = self.config.get_complete_url(
+        url = _CFG.get_complete_url(
             api_base="https://api.lexiq-nova.com",
-            model=self.model,
+            api_key=None,
+            model=_MODEL,
             optional_params={},
+            litellm_params={},
             stream=None,
         )
         
         assert url == "https://api.lexiq-nova.com/v1/embeddings"
         
         # Should handle trailing slashes
-        url2 = self.config.get_complete_url(
+        url2 = _CFG.get_complete_url(
             api_base="https://api.lexiq-nova.com/",
-            model=self.model,
+            api_key=None,
+            model=_MODEL,
             optional_params={},
+            litellm_params={},
             stream=None,
         )
         
@@ -162,11 +143,12 @@ class TestNovaEmbeddingsFeatures:
     def test_environment_validation(self):
         """Test API key and header setup"""
         headers = {}
-        result = self.config.validate_environment(
+        result = _CFG.validate_environment(
             headers=headers,
-            model=self.model,
+            model=_MODEL,
             messages=[],
             optional_params={},
+            litellm_params={},
             api_key="test-api-key",
         )
         
@@ -181,7 +163,7 @@ def test_nova_jina_v4_compatibility():
     
     Since Nova is built on Jina V4, it should handle the same inputs
     """
-    config = RemodlAIEmbeddingConfig()
+    config = RemodlaiEmbeddingsConfig()
     
     # Test dimensions parameter (Jina V4 feature)
     non_default = {"dimensions": 512}
@@ -262,8 +244,102 @@ def test_nova_embeddings_usage_example():
     # Verify the structure is valid
     assert "legal_retrieval" in example_usage
     assert example_usage["legal_retrieval"]["instructions"] is not None
-    assert example_usage["multimodal_chart_analysis"]["image"] is not None
+    assert example_usage["multimodal_chart_analysis"]["input"][0]["image"] is not None
     assert example_usage["code_search"]["return_multivector"] is True
     
     print("✅ Nova Embeddings V1 usage examples validated")
 
+
+def test_provider_info_resolves_secrets_once(monkeypatch):
+    from litellm.llms.remodlai_embeddings import common_utils
+
+    common_utils.clear_remodlai_embeddings_secrets_cache()
+    calls = []
+
+    def _fake_get_secret_str(secret_name):
+        calls.append(secret_name)
+        return {
+            "REMODLAI_EMBEDDINGS_API_BASE": "https://nova.example.com/v1",
+            "REMODLAI_EMBEDDINGS_API_KEY": "sk-nova",
+        }.get(secret_name)
+
+    monkeypatch.setattr(common_utils, "get_secret_str", _fake_get_secret_str)
+
+    config = RemodlaiEmbeddingsConfig()
+    for _ in range(3):
+        provider, api_base, api_key = config._get_openai_compatible_provider_info(
+            api_base=None, api_key=None
+        )
+        assert provider == "remodlai_embeddings"
+        assert api_base == "https://nova.example.com/v1"
+        assert api_key == "sk-nova"
+
+    assert len(calls) == 2
+    common_utils.clear_remodlai_embeddings_secrets_cache()
+
+
+def test_dimensions_sent_upstream_and_untruncated_response_warns_once():
+    from unittest.mock import patch
+
+    from litellm.llms.remodlai_embeddings.embedding import (
+        transformation as transformation_module,
+    )
+
+    config = RemodlaiEmbeddingsConfig()
+    request_data = config.transform_embedding_request(
+        model="nova-embeddings-v1",
+        input=["text input"],
+        optional_params={"dimensions": 128},
+        headers={},
+    )
+    assert request_data["dimensions"] == 128
+
+    transformation_module._warned_untruncated_dimensions.clear()
+    response_json = {"data": [{"embedding": [0.0] * 2048}]}
+    with patch.object(transformation_module.verbose_logger, "warning") as mock_warning:
+        for _ in range(2):
+            config._check_dimensions(
+                "nova-embeddings-v1", response_json, {"dimensions": 128}
+            )
+        config._check_dimensions(
+            "nova-embeddings-v1",
+            {"data": [{"embedding": [0.0] * 128}]},
+            {"dimensions": 128},
+        )
+    assert mock_warning.call_count == 1
+    transformation_module._warned_untruncated_dimensions.clear()
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("data:image/png;base64,iVBORw0KGgo=", True),
+        ("data:image/png;base64,QQ==", True),
+        ("data:image/png;base64,QUI=", True),
+        ("data:,", True),
+        # only the segment after the first comma is checked
+        ("data:image/png;base64,QUFB,trailing", True),
+        # `data:` prefix is required
+        ("iVBORw0KGgo=", False),
+        ("image/png;base64,QQ==", False),
+        ("Dog", False),
+        ("data:image/png;base64", False),
+        # non-canonical padding doesn't re-encode to itself
+        ("data:image/png;base64,QR==", False),
+        ("data:image/png;base64,QUJ=", False),
+        # bad length, stray padding, non-alphabet characters
+        ("data:image/png;base64,QUF", False),
+        ("data:image/png;base64,QQ=A", False),
+        ("data:image/png;base64,===", False),
+        ("data:image/png;base64,QU J", False),
+        ("data:text/plain,hello world", False),
+    ],
+)
+def test_is_base64_encoded_matches_litellm_utils(value, expected):
+    from litellm.llms.remodlai_embeddings.embedding.transformation import (
+        _is_base64_encoded,
+    )
+    from litellm.utils import is_base64_encoded
+
+    assert _is_base64_encoded(value) is expected
+    assert is_base64_encoded(value) is expected
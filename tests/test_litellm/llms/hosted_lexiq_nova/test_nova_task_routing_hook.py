@@ -4,173 +4,124 @@ Test Nova Task Routing Hook
 Verifies that the task parameter is correctly converted to tags
 for routing to the appropriate Nova adapter.
 """
+import asyncio
+
 import pytest
-from unittest.mock import MagicMock
 
 from litellm.proxy.hooks.nova_task_routing import NovaTaskRoutingHook
 
 
-class TestNovaTaskRoutingHook:
-    """Test the Nova task → tag conversion hook"""
+@pytest.fixture(scope="module")
+def hook():
+    return NovaTaskRoutingHook()
+
+
+@pytest.fixture(scope="module")
+def stubs():
+    # the hook never inspects user_api_key_dict or cache
+    return object(), object()
 
-    def setup_method(self):
-        self.hook = NovaTaskRoutingHook()
-        self.user_api_key_dict = MagicMock()
-        self.cache = MagicMock()
 
-    @pytest.mark.asyncio
-    async def test_retrieval_task_conversion(self):
-        """Test that retrieval task is converted to tag"""
-        data = {
+def _has_no_tags(result):
+    return "metadata" not in result or "tags" not in result.get("metadata", {})
+
+
+# (make_data, call_type, check) - make_data builds a fresh request dict per
+# call, since the hook mutates data in place; check receives the returned data
+CASES = [
+    # retrieval task is converted to tag; original task is preserved
+    (
+        lambda: {
             "model": "nova-embeddings-v1",
             "task": "retrieval",
-            "input": ["test input"]
-        }
-        
-        result = await self.hook.async_pre_call_hook(
-            user_api_key_dict=self.user_api_key_dict,
-            cache=self.cache,
-            data=data,
-            call_type="embeddings"
-        )
-        
-        assert "metadata" in result
-        assert "tags" in result["metadata"]
-        assert "retrieval" in result["metadata"]["tags"]
-        # Original task should be preserved
-        assert result["task"] == "retrieval"
-
-    @pytest.mark.asyncio
-    async def test_retrieval_passage_task_conversion(self):
-        """Test that retrieval.passage subtask is converted to tag"""
-        data = {
+            "input": ["test input"],
+        },
+        "embeddings",
+        lambda r: "retrieval" in r["metadata"]["tags"] and r["task"] == "retrieval",
+    ),
+    # retrieval.passage subtask is converted to tag
+    (
+        lambda: {
             "model": "nova-embeddings-v1",
             "task": "retrieval.passage",
-            "input": [{"text": "document to index"}]
-        }
-        
-        result = await self.hook.async_pre_call_hook(
-            user_api_key_dict=self.user_api_key_dict,
-            cache=self.cache,
-            data=data,
-            call_type="embeddings"
-        )
-        
-        assert result["metadata"]["tags"] == ["retrieval.passage"]
-
-    @pytest.mark.asyncio
-    async def test_code_query_task_conversion(self):
-        """Test that code.query task is converted to tag"""
-        data = {
+            "input": [{"text": "document to index"}],
+        },
+        "embeddings",
+        lambda r: r["metadata"]["tags"] == ["retrieval.passage"],
+    ),
+    # code.query task is converted to tag
+    (
+        lambda: {
             "model": "nova-embeddings-v1",
             "task": "code.query",
-            "input": [{"text": "function to parse JSON"}]
-        }
-        
-        result = await self.hook.async_pre_call_hook(
-            user_api_key_dict=self.user_api_key_dict,
-            cache=self.cache,
-            data=data,
-            call_type="embeddings"
-        )
-        
-        assert result["metadata"]["tags"] == ["code.query"]
-
-    @pytest.mark.asyncio
-    async def test_text_matching_task_conversion(self):
-        """Test that text-matching task is converted to tag"""
-        data = {
+            "input": [{"text": "function to parse JSON"}],
+        },
+        "embeddings",
+        lambda r: r["metadata"]["tags"] == ["code.query"],
+    ),
+    # text-matching task is converted to tag
+    (
+        lambda: {
             "model": "nova-embeddings-v1",
             "task": "text-matching",
-            "input": ["text1", "text2"]
-        }
-        
-        result = await self.hook.async_pre_call_hook(
-            user_api_key_dict=self.user_api_key_dict,
-            cache=self.cache,
-            data=data,
-            call_type="embeddings"
-        )
-        
-        assert result["metadata"]["tags"] == ["text-matching"]
-
-    @pytest.mark.asyncio
-    async def test_non_nova_model_passthrough(self):
-        """Test that non-Nova models are not modified"""
-        data = {
-            "model": "text-embedding-ada-002",
-            "input": ["test input"]
-        }
-        
-        result = await self.hook.async_pre_call_hook(
-            user_api_key_dict=self.user_api_key_dict,
-            cache=self.cache,
-            data=data,
-            call_type="embeddings"
-        )
-        
-        # Should not add metadata
-        assert "metadata" not in result or "tags" not in result.get("metadata", {})
-
-    @pytest.mark.asyncio
-    async def test_non_embedding_call_passthrough(self):
-        """Test that non-embedding calls are not modified"""
-        data = {
+            "input": ["text1", "text2"],
+        },
+        "embeddings",
+        lambda r: r["metadata"]["tags"] == ["text-matching"],
+    ),
+    # non-Nova models are not modified
+    (
+        lambda: {"model": "text-embedding-ada-002", "input": ["test input"]},
+        "embeddings",
+        _has_no_tags,
+    ),
+    # non-embedding calls are not modified
+    (
+        lambda: {
             "model": "nova-embeddings-v1",
-            "messages": [{"role": "user", "content": "test"}]
-        }
-        
-        result = await self.hook.async_pre_call_hook(
-            user_api_key_dict=self.user_api_key_dict,
-            cache=self.cache,
-            data=data,
-            call_type="completion"
-        )
-        
-        # Should not process non-embedding requests
-        assert "metadata" not in result or "tags" not in result.get("metadata", {})
-
-    @pytest.mark.asyncio
-    async def test_preserves_existing_tags(self):
-        """Test that existing tags are preserved"""
-        data = {
+            "messages": [{"role": "user", "content": "test"}],
+        },
+        "completion",
+        _has_no_tags,
+    ),
+    # existing tags are preserved and the task tag is added
+    (
+        lambda: {
             "model": "nova-embeddings-v1",
             "task": "retrieval",
-            "metadata": {
-                "tags": ["custom-tag"]
-            },
-            "input": ["test"]
-        }
-        
-        result = await self.hook.async_pre_call_hook(
-            user_api_key_dict=self.user_api_key_dict,
-            cache=self.cache,
-            data=data,
-            call_type="embeddings"
-        )
-        
-        # Should preserve existing tag and add task tag
-        assert "custom-tag" in result["metadata"]["tags"]
-        assert "retrieval" in result["metadata"]["tags"]
-        assert len(result["metadata"]["tags"]) == 2
-
-    @pytest.mark.asyncio
-    async def test_no_task_parameter(self):
-        """Test behavior when task parameter is missing"""
-        data = {
-            "model": "nova-embeddings-v1",
-            "input": ["test input"]
-        }
-        
-        result = await self.hook.async_pre_call_hook(
-            user_api_key_dict=self.user_api_key_dict,
-            cache=self.cache,
-            data=data,
-            call_type="embeddings"
-        )
-        
-        # Should not error, just log warning and return unchanged
-        assert result == data
+            "metadata": {"tags": ["custom-tag"]},
+            "input": ["test"],
+        },
+        "embeddings",
+        lambda r: r["metadata"]["tags"] == ["custom-tag", "retrieval"],
+    ),
+    # missing task logs a warning and returns the data unchanged
+    (
+        lambda: {"model": "nova-embeddings-v1", "input": ["test input"]},
+        "embeddings",
+        lambda r: r == {"model": "nova-embeddings-v1", "input": ["test input"]},
+    ),
+]
+
+
+@pytest.mark.asyncio
+async def test_all_routing_cases(hook, stubs):
+    """Test the Nova task → tag conversion hook across all cases"""
+    user_api_key_dict, cache = stubs
+    results = await asyncio.gather(
+        *[
+            hook.async_pre_call_hook(
+                user_api_key_dict=user_api_key_dict,
+                cache=cache,
+                data=make_data(),
+                call_type=call_type,
+            )
+            for make_data, call_type, _ in CASES
+        ]
+    )
+
+    for (make_data, _, check), result in zip(CASES, results):
+        assert check(result), make_data()
 
 
 def test_hook_singleton_exists():
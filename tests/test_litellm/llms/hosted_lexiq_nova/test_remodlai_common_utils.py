@@ -0,0 +1,40 @@
+import pytest
+
+from litellm.llms.remodlai.common_utils import get_remodlai_complete_url
+
+
+@pytest.mark.parametrize(
+    "api_base, expected",
+    [
+        ("https://api.example.com", "https://api.example.com/v1/embeddings"),
+        ("https://api.example.com/", "https://api.example.com/v1/embeddings"),
+        ("https://api.example.com/v1", "https://api.example.com/v1/embeddings"),
+        ("https://api.example.com/v1/", "https://api.example.com/v1/embeddings"),
+        (
+            "https://api.example.com/v1/embeddings",
+            "https://api.example.com/v1/embeddings",
+        ),
+    ],
+)
+def test_get_remodlai_complete_url(api_base, expected):
+    assert (
+        get_remodlai_complete_url(api_base, "REMODLAI_EMBEDDINGS_API_BASE", "embeddings")
+        == expected
+    )
+
+
+def test_get_remodlai_complete_url_falls_back_to_secret(monkeypatch):
+    get_remodlai_complete_url.cache_clear()
+    monkeypatch.setenv("REMODL_AI_API_BASE", "https://nova.example.com/v1")
+    assert (
+        get_remodlai_complete_url(None, "REMODL_AI_API_BASE", "responses")
+        == "https://nova.example.com/v1/responses"
+    )
+    get_remodlai_complete_url.cache_clear()
+
+
+def test_get_remodlai_complete_url_raises_without_api_base(monkeypatch):
+    get_remodlai_complete_url.cache_clear()
+    monkeypatch.delenv("REMODL_AI_API_BASE", raising=False)
+    with pytest.raises(ValueError, match="REMODL_AI_API_BASE is not set"):
+        get_remodlai_complete_url(None, "REMODL_AI_API_BASE", "responses")
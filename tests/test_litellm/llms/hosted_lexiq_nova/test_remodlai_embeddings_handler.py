@@ -0,0 +1,221 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from litellm.llms.remodlai_embeddings.embedding.handler import (
+    RemodlaiEmbeddingsHandler,
+)
+from litellm.types.utils import EmbeddingResponse, Usage
+
+
+def _fake_batch_response(**kwargs):
+    batch = kwargs["input"]
+    return EmbeddingResponse(
+        model="nova-embeddings-v1",
+        data=[
+            {"object": "embedding", "index": i, "embedding": [float(len(text))]}
+            for i, text in enumerate(batch)
+        ],
+        usage=Usage(prompt_tokens=len(batch), total_tokens=len(batch)),
+    )
+
+
+def _call_embedding(
+    handler,
+    input,
+    optional_params,
+    aembedding=False,
+    api_base="https://api.example.com/v1",
+):
+    return handler.embedding(
+        model="nova-embeddings-v1",
+        input=input,
+        timeout=600,
+        logging_obj=MagicMock(),
+        api_base=api_base,
+        optional_params=optional_params,
+        litellm_params={},
+        model_response=EmbeddingResponse(),
+        aembedding=aembedding,
+    )
+
+
+def test_embedding_single_batch_passes_through():
+    handler = RemodlaiEmbeddingsHandler()
+    handler.base_llm_http_handler = MagicMock()
+    handler.base_llm_http_handler.embedding.side_effect = _fake_batch_response
+
+    _call_embedding(handler, ["a", "bb"], {"task": "retrieval", "batch_size": 4})
+
+    handler.base_llm_http_handler.embedding.assert_called_once()
+    call_kwargs = handler.base_llm_http_handler.embedding.call_args.kwargs
+    assert call_kwargs["input"] == ["a", "bb"]
+    assert "batch_size" not in call_kwargs["optional_params"]
+
+
+def test_embedding_splits_into_batches_and_merges():
+    handler = RemodlaiEmbeddingsHandler()
+    handler.base_llm_http_handler = MagicMock()
+    handler.base_llm_http_handler.embedding.side_effect = _fake_batch_response
+
+    inputs = ["a", "bb", "ccc", "dddd", "eeeee"]
+    response = _call_embedding(handler, inputs, {"batch_size": 2})
+
+    assert handler.base_llm_http_handler.embedding.call_count == 3
+    assert [item["index"] for item in response.data] == [0, 1, 2, 3, 4]
+    assert [item["embedding"] for item in response.data] == [
+        [1.0],
+        [2.0],
+        [3.0],
+        [4.0],
+        [5.0],
+    ]
+    assert response.usage.prompt_tokens == 5
+    assert response.usage.total_tokens == 5
+
+
+@pytest.mark.asyncio
+async def test_aembedding_sends_batches_concurrently():
+    handler = RemodlaiEmbeddingsHandler()
+    handler.base_llm_http_handler = MagicMock()
+
+    async def _async_fake_batch_response(**kwargs):
+        return _fake_batch_response(**kwargs)
+
+    handler.base_llm_http_handler.embedding.side_effect = (
+        lambda **kwargs: _async_fake_batch_response(**kwargs)
+    )
+
+    response = await _call_embedding(
+        handler, ["a", "bb", "ccc"], {"batch_size": 2}, aembedding=True
+    )
+
+    assert handler.base_llm_http_handler.embedding.call_count == 2
+    assert [item["embedding"] for item in response.data] == [[1.0], [2.0], [3.0]]
+
+
+def test_embedding_retries_rate_limited_batch(monkeypatch):
+    from litellm.llms.remodlai_embeddings.common_utils import RemodlaiEmbeddingsError
+    from litellm.llms.remodlai_embeddings.embedding import handler as handler_module
+
+    sleeps = []
+    monkeypatch.setattr(handler_module.time, "sleep", sleeps.append)
+
+    handler = RemodlaiEmbeddingsHandler()
+    handler.base_llm_http_handler = MagicMock()
+    handler.base_llm_http_handler.embedding.side_effect = [
+        RemodlaiEmbeddingsError(
+            status_code=429, message="rate limited", headers={"retry-after": "2"}
+        ),
+        _fake_batch_response(input=["a"]),
+    ]
+
+    response = _call_embedding(handler, ["a"], {})
+
+    assert handler.base_llm_http_handler.embedding.call_count == 2
+    assert len(sleeps) == 1 and 2 <= sleeps[0] < 3
+    assert response.data[0]["embedding"] == [1.0]
+
+
+def test_embedding_does_not_retry_client_errors(monkeypatch):
+    from litellm.llms.remodlai_embeddings.common_utils import RemodlaiEmbeddingsError
+    from litellm.llms.remodlai_embeddings.embedding import handler as handler_module
+
+    monkeypatch.setattr(handler_module.time, "sleep", lambda _: None)
+
+    handler = RemodlaiEmbeddingsHandler()
+    handler.base_llm_http_handler = MagicMock()
+    handler.base_llm_http_handler.embedding.side_effect = RemodlaiEmbeddingsError(
+        status_code=400, message="bad request"
+    )
+
+    with pytest.raises(RemodlaiEmbeddingsError):
+        _call_embedding(handler, ["a"], {})
+    assert handler.base_llm_http_handler.embedding.call_count == 1
+
+
+def test_embedding_serves_repeated_images_from_cache():
+    from litellm.llms.remodlai_embeddings.embedding import handler as handler_module
+
+    handler_module._image_embedding_cache.clear()
+    image = "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+
+    handler = RemodlaiEmbeddingsHandler()
+    handler.base_llm_http_handler = MagicMock()
+    handler.base_llm_http_handler.embedding.side_effect = _fake_batch_response
+
+    first = _call_embedding(handler, [image, "text"], {"task": "retrieval"})
+    second = _call_embedding(handler, ["text", image], {"task": "retrieval"})
+
+    assert handler.base_llm_http_handler.embedding.call_count == 2
+    # the cached image is held out of the second upstream request
+    assert handler.base_llm_http_handler.embedding.call_args.kwargs["input"] == ["text"]
+    assert second.data[1]["embedding"] == first.data[0]["embedding"]
+    assert [item["index"] for item in second.data] == [0, 1]
+
+    # a different task produces a different vector, so it must not hit the cache
+    _call_embedding(handler, [image], {"task": "code"})
+    assert handler.base_llm_http_handler.embedding.call_count == 3
+
+    # neither may a different Nova server behind the same model name
+    _call_embedding(
+        handler, [image], {"task": "retrieval"}, api_base="https://nova-2.example.com"
+    )
+    assert handler.base_llm_http_handler.embedding.call_count == 4
+    handler_module._image_embedding_cache.clear()
+
+
+def test_image_embedding_cache_is_isolated_and_skips_duplicate_evictions(
+    monkeypatch,
+):
+    from litellm.llms.remodlai_embeddings.embedding import handler as handler_module
+
+    handler_module._image_embedding_cache.clear()
+    monkeypatch.setattr(handler_module._image_embedding_cache, "max_size", 2)
+    image_a = "data:image/png;base64,QUFBQQ=="
+    image_b = "data:image/png;base64,QkJCQg=="
+
+    handler = RemodlaiEmbeddingsHandler()
+    handler.base_llm_http_handler = MagicMock()
+    handler.base_llm_http_handler.embedding.side_effect = _fake_batch_response
+
+    _call_embedding(handler, [image_a], {"task": "retrieval"})
+    # a duplicate image within one request must not evict the other entry
+    first = _call_embedding(handler, [image_b, image_b], {"task": "retrieval"})
+    assert len(handler_module._image_embedding_cache) == 2
+
+    # mutating a returned vector must not corrupt the cached one
+    first.data[0]["embedding"].append(99.0)
+    second = _call_embedding(handler, [image_a, image_b], {"task": "retrieval"})
+    assert handler.base_llm_http_handler.embedding.call_count == 2
+    assert second.data[1]["embedding"] == [float(len(image_b))]
+    handler_module._image_embedding_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_aembedding_cancels_in_flight_batches_on_failure():
+    import asyncio
+
+    from litellm.llms.remodlai_embeddings.common_utils import RemodlaiEmbeddingsError
+
+    cancelled = []
+
+    async def _fake(**kwargs):
+        if kwargs["input"] == ["a"]:
+            raise RemodlaiEmbeddingsError(status_code=400, message="bad request")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(kwargs["input"])
+            raise
+        return _fake_batch_response(**kwargs)
+
+    handler = RemodlaiEmbeddingsHandler()
+    handler.base_llm_http_handler = MagicMock()
+    handler.base_llm_http_handler.embedding.side_effect = lambda **kwargs: _fake(
+        **kwargs
+    )
+
+    with pytest.raises(RemodlaiEmbeddingsError):
+        await _call_embedding(handler, ["a", "b"], {"batch_size": 1}, aembedding=True)
+    assert cancelled == [["b"]]